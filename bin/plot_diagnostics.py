@@ -2,6 +2,7 @@
 """
 Create diagnostic plots for a particular survey strategy.
 """
+from __future__ import print_function
 
 #import sys
 import os
@@ -12,6 +13,8 @@ import ephem
 import obztak.utils.ortho
 import obztak.utils.fileio
 
+from obztak.utils.compat import input
+
 plt.ion()
 
 ############################################################
@@ -21,14 +24,14 @@ def movie(infile_accomplished_fields, infile_target_fields=None, outdir=None, ch
 
     #accomplished_fields = np.recfromtxt(infile_accomplished_fields, delimiter=',', names=True)
     accomplished_fields = obztak.utils.fileio.csv2rec(infile_accomplished_fields)
-    print len(accomplished_fields)
+    print(len(accomplished_fields))
 
     if infile_target_fields is not None:
         #target_fields = np.recfromtxt(infile_target_fields, names=True)
         target_fields = obztak.utils.fileio.csv2rec(infile_target_fields)
 
     for ii in range(0, 1000):
-        print ii, accomplished_fields['DATE'][ii * chunk]
+        print(ii, accomplished_fields['DATE'][ii * chunk])
         fig, basemap = obztak.utils.ortho.makePlot(accomplished_fields['DATE'][ii * chunk], figsize=(10.5 / 2., 8.5 / 2.), s=25, dpi=160, moon=False)
 
         if infile_target_fields is not None:
@@ -62,7 +65,7 @@ def movie(infile_accomplished_fields, infile_target_fields=None, outdir=None, ch
             break
 
     if outdir is not None:
-        print 'Generating animated gif...'
+        print('Generating animated gif...')
         os.system('convert -set delay 10 -loop 0 %s/*.gif %s/output.gif'%(outdir, outdir))
 
 ############################################################
@@ -100,7 +103,7 @@ def slew(infile_accomplished_fields, tag=None):
 
     cut = accomplished_fields['SLEW'] > 10.
     for index in np.nonzero(cut)[0]:
-        print accomplished_fields['SLEW'][index], accomplished_fields['RA'][index], accomplished_fields['DEC'][index], accomplished_fields['DATE'][index]
+        print(accomplished_fields['SLEW'][index], accomplished_fields['RA'][index], accomplished_fields['DEC'][index], accomplished_fields['DATE'][index])
 
 ############################################################
 
@@ -123,7 +126,7 @@ def slewAnalysis(infile_accomplished_fields):
         basemap.scatter(*proj, c=np.arange(index_min, index_max), edgecolor='none', s=50, vmin=index_min, vmax=index_max, cmap='Spectral')
         colorbar = plt.colorbar(label='Index')
 
-        raw_input('%i %.1f'%(index, accomplished_fields['SLEW'][index]))
+        input('%i %.1f'%(index, accomplished_fields['SLEW'][index]))
         plt.clf()
 
 ############################################################
@@ -230,7 +233,7 @@ def tiling(infile_accomplished_fields, infile_target_fields=None, tag=None):
     plt.figure()
     for ii, color in enumerate(['black', 'red', 'blue', 'green']):
         if infile_target_fields is not None:
-            print ii + 1, np.sum(target_fields['TILING'] == (ii + 1))
+            print(ii + 1, np.sum(target_fields['TILING'] == (ii + 1)))
             y = np.cumsum(accomplished_fields['TILING'] == (ii + 1)) / float(np.sum(target_fields['TILING'] == (ii + 1)))
         else:
             y = np.cumsum(accomplished_fields['TILING'] == (ii + 1))
@@ -264,7 +267,7 @@ if __name__ == '__main__':
                         help='save plots with the given tag.')
     args = parser.parse_args()
 
-    print args
+    print(args)
 
     #if len(sys.argv) > 1:
     #    infile_scheduled_fields = sys.argv[1]
@@ -289,6 +292,6 @@ if __name__ == '__main__':
     
     tiling(args.scheduled, infile_target_fields='target_fields.csv', tag=args.tag)
 
-    raw_input('...wait...')
+    input('...wait...')
 
 ############################################################
@@ -2,6 +2,7 @@
 """
 Code related to the Magellanic Satellites Survey (MagLiteS).
 """
+from __future__ import print_function
 import os,sys
 import logging
 import copy
@@ -316,7 +317,7 @@ class BlissSurvey(Survey):
             vec = hp.ang2vec(np.radians(90.-dec[idx]),np.radians(ra[idx]))
             f = []
             for i,v in enumerate(vec):
-                print '\r%s/%s'%(i+1,len(vec)),
+                print('\r%s/%s'%(i+1,len(vec)),end='')
                 sys.stdout.flush()
                 pix = hp.query_disc(nside,v,np.radians(constants.DECAM))
                 f.append(skymap[pix].sum()/float(len(pix)))
@@ -418,7 +419,7 @@ class AlfredoFieldArray(FieldArray):
 
 
 class BlissScheduler(Scheduler):
-    _defaults = odict(Scheduler._defaults.items() + [
+    _defaults = odict(list(Scheduler._defaults.items()) + [
         ('tactician','coverage'),
         ('windows',os.path.join(fileio.get_datadir(),"bliss-windows.csv")),
         ('targets',os.path.join(fileio.get_datadir(),"bliss-target-fields.csv")),
@@ -15,6 +15,9 @@ from obztak.utils import projector as proj
 # WARNING: copy.deepcopy doesn't work for ephem.Observer
 # need to use ephem.Observer.copy
 
+# Parsed telescope constraint tables (keyed by filename)
+CONSTRAINTS = dict()
+
 class CTIO(ephem.Observer):
     """ Utility class for defining CTIO """
     def __init__(self):
@@ -61,21 +64,29 @@ class CTIO(ephem.Observer):
         return obs.next_setting(ephem.Sun(), use_center=True)
 
     def _load_constraints(self, filename=None):
-        """ Load Blanco constraint data """
+        """ Load Blanco constraint data (parsed once per file) """
         if filename is None:
             from obztak.utils import fileio
             filename = os.path.join(fileio.get_datadir(),'blanco_hour_angle_limits.dat')
-        self.constraints = np.recfromtxt(filename, names=True)
 
-        # ADW: This is not very pythonic....
-        ha_degrees = np.tile(0., len(self.constraints['HA']))
-        for ii in range(0, len(self.constraints['HA'])):
-            ha_degrees[ii] = proj.hms2dec(self.constraints['HA'][ii])
+        if filename not in CONSTRAINTS:
+            constraints = np.recfromtxt(filename, names=True)
+
+            # Parse 'HH:MM:SS' into an (N,3) array and convert in one pass
+            # (the column is bytes under Python 3; split it as str)
+            ha = np.char.split(constraints['HA'].astype(str),':')
+            hms = np.array(ha.tolist(),dtype=float)
+            ha_degrees = proj.hms2dec(hms)
+
+            # Buffer to protect us from the chicken
+            ha_degrees -= 1.25 
+
+            # Shared between instances; protect from modification
+            constraints.flags.writeable = False
+            ha_degrees.flags.writeable = False
+            CONSTRAINTS[filename] = (constraints, ha_degrees)
 
-        # Buffer to protect us from the chicken
-        ha_degrees -= 1.25 
-        
-        self.ha_degrees = ha_degrees
+        self.constraints, self.ha_degrees = CONSTRAINTS[filename]
         return self.ha_degrees
 
     def hour_angle_limit(self, dec):
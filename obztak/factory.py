@@ -8,6 +8,8 @@ import inspect
 import importlib
 import logging
 
+from obztak.utils.compat import basestring
+
 from obztak import get_survey
 
 SURVEYS = odict([
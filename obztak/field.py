@@ -14,16 +14,19 @@ from obztak.utils import constants
 from obztak.utils import fileio
 from obztak.utils.date import setdefaults
 
-# Default field array values
+from obztak.utils.compat import basestring
+
+# Default field array values (text columns are `str`: bytes under
+# Python 2 and unicode under Python 3)
 DEFAULTS = odict([
     ('HEX',       dict(dtype=int,value=0)),
     ('RA',        dict(dtype=float,value=None)),
     ('DEC',       dict(dtype=float,value=None)),
-    ('FILTER',    dict(dtype='S1',value='')),
+    ('FILTER',    dict(dtype=(str,1),value='')),
     ('EXPTIME',   dict(dtype=float,value=90)),
     ('TILING',    dict(dtype=int,value=0)),
     ('PRIORITY',  dict(dtype=int,value=1)),
-    ('DATE',      dict(dtype='S30',value='')),
+    ('DATE',      dict(dtype=(str,30),value='')),
     ('AIRMASS',   dict(dtype=float,value=-1.0)),
     ('SLEW',      dict(dtype=float,value=-1.0)),
     ('MOONANGLE', dict(dtype=float,value=-1.0)),
@@ -80,7 +83,7 @@ class FieldArray(np.recarray):
 
     def __new__(cls,shape=0):
         # Need to do it this way so that array can be resized...
-        dtype = DTYPES.items()
+        dtype = list(DTYPES.items())
         self = np.recarray(shape,dtype=dtype).view(cls)
         values = VALUES.items()
         for k,v in values: self[k].fill(v)
@@ -121,11 +124,11 @@ class FieldArray(np.recarray):
 
     @property
     def object(self):
-        return np.char.mod(self.OBJECT_FMT,self.unique_id).astype('S80')
+        return np.char.mod(self.OBJECT_FMT,self.unique_id).astype((str,80))
 
     @property
     def seqid(self):
-        return np.char.mod(self.SEQID_FMT,self).astype('S80')
+        return np.char.mod(self.SEQID_FMT,self).astype((str,80))
 
     @property
     def seqnum(self):
@@ -282,7 +285,7 @@ class FieldArray(np.recarray):
 
         logging.debug(query)
         data = database.execute(query)
-        names = map(str.upper,database.get_columns())
+        names = [c.upper() for c in database.get_columns()]
         objidx = names.index('OBJECT')
         if not len(data):
             logging.warn("No fields found in database.")
@@ -306,7 +309,7 @@ class FieldArray(np.recarray):
             sispi = fileio.read_json(filename)
             return cls().load_sispi(sispi)
         elif ext in ('.csv','.txt'):
-            dtype = DTYPES.items()
+            dtype = list(DTYPES.items())
             #recarray = fileio.csv2rec(filename,dtype=dtype)
             recarray = fileio.csv2rec(filename)
             return cls().load_recarray(recarray)
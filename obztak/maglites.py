@@ -88,7 +88,7 @@ class MaglitesSurvey(Survey):
 
         if infile is None:
             infile = os.path.join(fileio.get_datadir(),'smash_fields_alltiles.txt')
-        data = np.recfromtxt(infile, names=True)
+        data = self.read_tiles(infile)
 
         # Apply footprint selection after tiling/dither
         #sel = obztak.utils.projector.footprint(data['RA'],data['DEC'])
@@ -108,22 +108,27 @@ class MaglitesSurvey(Survey):
         logging.info("Number of tilings: %d"%ntilings)
         logging.info("Number of filters: %d"%nbands)
 
+        # Fields are ordered by (tiling, hex, band); fill each column
+        # through a broadcast view with that shape
+        shape = (ntilings,nhexes,nbands)
         fields = FieldArray(nfields)
-        fields['HEX'] = np.tile(np.repeat(smash_id,nbands),ntilings)
+        fields['HEX'].reshape(shape)[:] = smash_id[np.newaxis,:,np.newaxis]
         fields['PRIORITY'].fill(1)
-        fields['TILING'] = np.repeat(np.arange(1,ntilings+1),nhexes*nbands)
-        fields['FILTER'] = np.tile(BANDS,nhexes*ntilings)
+        fields['TILING'].reshape(shape)[:] = np.arange(1,ntilings+1)[:,np.newaxis,np.newaxis]
+        fields['FILTER'].reshape(shape)[:] = np.asarray(BANDS)[np.newaxis,np.newaxis,:]
 
+        ra_view = fields['RA'].reshape(shape)
+        dec_view = fields['DEC'].reshape(shape)
         #for i in range(ntilings):
         for i,tiling in enumerate(TILINGS):
-            idx0 = i*nhexes*nbands
-            idx1 = idx0+nhexes*nbands
             ra_dither,dec_dither = dither(ra,dec,tiling[0],tiling[1])
-            fields['RA'][idx0:idx1] = np.repeat(ra_dither,nbands)
-            fields['DEC'][idx0:idx1] = np.repeat(dec_dither,nbands)
+            ra_view[i] = ra_dither[:,np.newaxis]
+            dec_view[i] = dec_dither[:,np.newaxis]
 
-        # Apply footprint selection after tiling/dither
-        sel = self.footprint(fields['RA'],fields['DEC']) # NORMAL OPERATION
+        # Apply footprint selection after tiling/dither (once per
+        # pointing, since the bands share the same position)
+        sel = self.footprint(ra_view[:,:,0].ravel(),dec_view[:,:,0].ravel()) # NORMAL OPERATION
+        sel = np.repeat(sel,nbands)
         if smcnod:
             # Include SMC northern overdensity fields
             sel_smcnod = self.footprintSMCNOD(fields) # SMCNOD OPERATION
@@ -163,18 +168,25 @@ class MaglitesSurvey(Survey):
 
     @staticmethod
     def footprint(ra,dec):
-        l, b = cel2gal(ra, dec)
-
-        angsep_lmc = angsep(constants.RA_LMC, constants.DEC_LMC, ra, dec)
-        angsep_smc = angsep(constants.RA_SMC, constants.DEC_SMC, ra, dec)
-        sel = (np.fabs(b) > 10.) \
-              & ((angsep_lmc < 30.) | (angsep_smc < 30.)) \
-              & (dec < -55.) & (ra > 100.) & (ra < 300.)
+        shape = np.shape(ra)
+        ra,dec = np.atleast_1d(ra,dec)
+
+        # Only evaluate the Galactic latitude and the Magellanic Cloud
+        # separations for fields that pass the cheap box selection
+        sel = (dec < -55.) & (ra > 100.) & (ra < 300.)
+        idx = np.flatnonzero(sel)
+        _ra,_dec = ra[idx],dec[idx]
+
+        l, b = cel2gal(_ra, _dec)
+        angsep_lmc = angsep(constants.RA_LMC, constants.DEC_LMC, _ra, _dec)
+        angsep_smc = angsep(constants.RA_SMC, constants.DEC_SMC, _ra, _dec)
+        sel[idx] = (np.fabs(b) > 10.) \
+                   & ((angsep_lmc < 30.) | (angsep_smc < 30.))
         #sel = sel | ((dec < -65.) & (angsep_lmc > 5.) & (angsep_smc > 5.))
         sel = sel | ((dec < -65.) & (ra > 300.) & (ra < 360.)) # SMC
         sel = sel | (dec < -80.)
 
-        return sel
+        return sel.reshape(shape)
 
     @staticmethod
     def footprintSMCNOD(fields):
@@ -241,7 +253,7 @@ class MaglitesFieldArray(FieldArray):
 
 
 class MaglitesScheduler(Scheduler):
-    _defaults = odict(Scheduler._defaults.items() + [
+    _defaults = odict(list(Scheduler._defaults.items()) + [
         ('tactician','coverage'),
         ('windows',os.path.join(fileio.get_datadir(),"maglites-windows.csv")),
         ('targets',os.path.join(fileio.get_datadir(),"maglites-target-fields.csv")),
@@ -3,7 +3,6 @@ Module providing the survey scheduler.
 """
 
 import os,sys
-import copy
 import numpy as np
 import time
 import ephem
@@ -25,6 +24,8 @@ from obztak.tactician import CoverageTactician
 from obztak.utils.date import get_nite, datestr, datestring, nitestring, utc2nite
 from obztak.factory import tactician_factory
 
+from obztak.utils.compat import basestring, input
+
 # For debugging (use the verbose command line argument)
 #logging.basicConfig(level=20) # KCB
 
@@ -42,6 +43,9 @@ class Scheduler(object):
     FieldType = FieldArray
 
     def __init__(self,target_fields=None,windows=None,completed_fields=None):
+        self._last_completed = (None, None)
+        self._buffers = dict()
+        self._tacticians = dict()
         self.load_target_fields(target_fields)
         self.load_windows(windows)
         self.load_observed_fields()
@@ -58,6 +62,13 @@ class Scheduler(object):
             self.target_fields = self.FieldType.read(target_fields)
         else:
             self.target_fields = self.FieldType(target_fields)
+
+        # Map from unique id to index for flagging completed fields
+        self._target_index = dict()
+        for i,uid in enumerate(self.target_fields['ID']):
+            self._target_index.setdefault(uid,[]).append(i)
+        if hasattr(self,'completed_fields'): self._update_incomplete()
+
         return self.target_fields
 
     def load_windows(self, windows=None):
@@ -84,11 +95,34 @@ class Scheduler(object):
             if ii > 0 and (start < self.windows[ii-1][1]):
                 logging.warn(msg)
 
+        # Sorted window starts and the running maximum of the window
+        # ends for a binary search of the window containing a date
+        starts = np.array([w[0] for w in self.windows],dtype=float)
+        ends = np.array([w[1] for w in self.windows],dtype=float)
+        idx = np.argsort(starts,kind='mergesort')
+        self._window_starts = starts[idx]
+        self._window_ends = np.maximum.accumulate(ends[idx])
+
         logging.info('Observation Windows:')
         for start,end in self.windows:
             logging.info('  %s: %s UTC -- %s UTC'%(get_nite(start),datestr(start),datestr(end)))
         logging.info(30*'-')
 
+    def _inside_window(self, date):
+        """Check whether a date falls inside an observation window.
+
+        Parameters:
+        -----------
+        date   : ephem.Date object
+
+        Returns:
+        --------
+        inside : True if `start <= date < end` for any window
+        """
+        date = float(date)
+        idx = np.searchsorted(self._window_starts,date,side='right') - 1
+        return bool(idx >= 0 and date < self._window_ends[idx])
+
     def load_observed_fields(self):
         """
         Load fields from the telemetry database that were already observed.
@@ -119,15 +153,18 @@ class Scheduler(object):
         if isinstance(completed_fields,list):
             if completed_fields[0].lower()=='none':
                 self.completed_fields = self.FieldType()
+                self._update_incomplete()
                 return self.completed_fields
         elif isinstance(completed_fields,basestring):
             if completed_fields.lower()=='none':
                 self.completed_fields = self.FieldType()
+                self._update_incomplete()
                 return self.completed_fields
 
-        self.completed_fields = copy.deepcopy(self.observed_fields)
+        self.completed_fields = self.observed_fields.copy()
 
         if not completed_fields:
+            self._update_incomplete()
             return self.completed_fields
 
         if isinstance(completed_fields,basestring):
@@ -143,12 +180,80 @@ class Scheduler(object):
         new=~np.in1d(completed_fields.unique_id,self.completed_fields.unique_id)
         new_fields = completed_fields[new]
         self.completed_fields = self.completed_fields + new_fields
+        self._update_incomplete()
         return self.completed_fields
 
+    def _update_incomplete(self, fields=None):
+        """Update the mask of target fields that have not been completed.
+
+        Parameters:
+        -----------
+        fields : Newly completed fields to flag. If `None`, rebuild the
+                 mask from all completed fields.
+
+        Returns:
+        --------
+        incomplete : Boolean mask of incomplete target fields
+        """
+        if fields is None:
+            self._incomplete = ~np.in1d(self.target_fields['ID'],
+                                        self.completed_fields['ID'])
+        else:
+            for uid in fields['ID']:
+                self._incomplete[self._target_index.get(uid,[])] = False
+
+        # Keep track of the completed fields included in the mask
+        self._flagged = (self.completed_fields, len(self.completed_fields))
+        return self._incomplete
+
     def create_tactician(self,tactician=None):
         if tactician is None: tactician = self._defaults['tactician']
         return tactician_factory(tactician,mode=tactician)
 
+    def _extend(self, name, fields):
+        """
+        Append fields to the FieldArray attribute `name`.
+
+        The attribute is a view into a larger buffer whose capacity
+        doubles when it is exhausted, so that scheduling N exposures
+        copies O(N) fields rather than O(N^2). If the attribute has
+        been replaced since the last append the buffer is rebuilt.
+
+        Parameters:
+        -----------
+        name   : Name of the FieldArray attribute (e.g., 'completed_fields')
+        fields : The fields to append
+
+        Returns:
+        --------
+        fields : The extended FieldArray
+        """
+        current = getattr(self, name)
+        buf,view = self._buffers.get(name,(None,None))
+        nold,nnew = len(current),len(current)+len(fields)
+
+        if (current is not view) or (nnew > len(buf)):
+            buf = self.FieldType(max(2*nnew,256))
+            buf[:nold] = current
+
+        buf[nold:nnew] = fields
+        view = buf[:nnew]
+        self._buffers[name] = (buf,view)
+        setattr(self, name, view)
+        return view
+
+    def _last_completed_date(self):
+        """
+        Date of the last completed field (None if there are no
+        completed fields). The date string is only parsed when it
+        differs from the previous call.
+        """
+        if not len(self.completed_fields): return None
+        date = self.completed_fields[-1]['DATE']
+        if self._last_completed[0] != date:
+            self._last_completed = (date, ephem.Date(date))
+        return self._last_completed[1]
+
     def select_field(self, date, mode='coverage'):
         """
         Select field(s) using the survey tactician.
@@ -162,22 +267,37 @@ class Scheduler(object):
         --------
         field      : selected field(s) from tactician
         """
-        sel = ~np.in1d(self.target_fields['ID'],self.completed_fields['ID'])
-
-        self.tactician = self.create_tactician(mode)
+        # Rebuild the mask if completed fields were changed externally
+        flagged,nflagged = self._flagged
+        if (flagged is not self.completed_fields) or \
+           (nflagged != len(self.completed_fields)):
+            self._update_incomplete()
+        sel = self._incomplete
+
+        # Tacticians are created once per mode and reused
+        if mode not in self._tacticians:
+            self._tacticians[mode] = self.create_tactician(mode)
+        self.tactician = self._tacticians[mode]
         self.tactician.set_date(date)
-        self.tactician.set_target_fields(self.target_fields[sel])
-        self.tactician.set_completed_fields(self.completed_fields)
+        # The static per-field quantities are only derived when the
+        # target fields change; completed fields are masked out
+        if self.tactician.fields is not self.target_fields:
+            self.tactician.set_target_fields(self.target_fields)
+        self.tactician.set_available_fields(sel)
+        self.tactician.set_completed_fields(self.completed_fields,
+                                            self._last_completed_date())
 
         field_select = self.tactician.select_fields()
 
-        logging.debug(str(field_select))
+        # Formatting the record array is expensive; only do it if needed
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(str(field_select))
 
         # For diagnostic purposes
         if False and len(self.scheduled_fields) % 10 == 0:
             weight = self.tactician.weight
             ortho.plotWeight(field_select[-1], self.target_fields, self.tactician.weight)
-            raw_input('WAIT')
+            input('WAIT')
 
         if len(field_select) == 0:
             logging.error("No field selected... we've got problems.")
@@ -188,7 +308,7 @@ class Scheduler(object):
             logging.info(msg)
             #ortho.plotWeight(self.scheduled_fields[-1], self.target_fields, self.tactician.weight)
             ortho.plotField(self.scheduled_fields[-1],self.scheduled_fields,options_basemap=dict(date='2017/02/20 05:00:00'))
-            raw_input('WAIT')
+            input('WAIT')
             import pdb; pdb.set_trace()
             raise Exception()
 
@@ -237,17 +357,12 @@ class Scheduler(object):
         date = tstart
         latch = True
         while latch:
-            logging.debug(' '+datestr(date,4))
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(' '+datestr(date,4))
 
             # Check to see if in valid observation window
             if self.windows is not None:
-                inside = False
-                for window in self.windows:
-                    if date >= window[0] and date < window[-1]:
-                        inside = True
-                        break
-
-                if not inside:
+                if not self._inside_window(date):
                     if clip:
                         break
                     else:
@@ -257,18 +372,20 @@ class Scheduler(object):
             # Select one (or more) fields from the tactician
             field_select = self.select_field(date, mode)
 
-            # Now update the time from the selected field
-            date = ephem.Date(field_select[-1]['DATE']) + constants.FIELDTIME
+            self._extend('completed_fields', field_select)
+            self._extend('scheduled_fields', field_select)
+            self._update_incomplete(field_select)
 
-            self.completed_fields = self.completed_fields + field_select
-            self.scheduled_fields = self.scheduled_fields + field_select
+            # Now update the time from the selected field
+            date = self._last_completed_date() + constants.FIELDTIME
 
-            msg=" %(DATE).19s: id=%(ID)10s, secz=%(AIRMASS).2f, slew=%(SLEW).2f"
-            msg+=", moon=%(PHASE).0f%%,%(ALT).0fdeg"
-            for i,f in zip(field_select.unique_id,field_select):
-                params = dict([('ID',i)]+[(k,f[k]) for k in f.dtype.names])
-                params.update({'PHASE':self.tactician.moon.phase,"ALT":np.degrees(self.tactician.moon.alt)})
-                logging.info(msg%params)
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                msg=" %(DATE).19s: id=%(ID)10s, secz=%(AIRMASS).2f, slew=%(SLEW).2f"
+                msg+=", moon=%(PHASE).0f%%,%(ALT).0fdeg"
+                for i,f in zip(field_select.unique_id,field_select):
+                    params = dict([('ID',i)]+[(k,f[k]) for k in f.dtype.names])
+                    params.update({'PHASE':self.tactician.moon.phase,"ALT":np.degrees(self.tactician.moon.alt)})
+                    logging.info(msg,params)
 
             #if plot: self.plotField(date, field_select)
             if plot:
@@ -307,8 +424,8 @@ class Scheduler(object):
         index = np.nonzero(select)[0]
 
         field = self.target_fields[select]
-        nfields = select.sum()
-        field['DATE'] = map(datestring,nfields*[date])
+        # All exposures share the same date; format it once
+        field['DATE'] = datestring(date)
         return field
 
     def schedule_chunk(self,tstart=None,chunk=60,clip=False,plot=False,mode=None):
@@ -387,14 +504,14 @@ class Scheduler(object):
             if plot:
                 field_select = scheduled_fields[-1:]
                 ortho.plotField(field_select,self.target_fields,self.completed_fields)
-                if (raw_input(' ...continue ([y]/n)').lower()=='n'):
+                if (input(' ...continue ([y]/n)').lower()=='n'):
                     break
 
             chunks.append(scheduled_fields)
             start = ephem.Date(chunks[-1]['DATE'][-1]) + constants.FIELDTIME
             #start = end
 
-        if plot: raw_input(' ...finish... ')
+        if plot: input(' ...finish... ')
 
         return chunks
 
@@ -438,10 +555,10 @@ class Scheduler(object):
             if plot:
                 ortho.plotField(self.completed_fields[-1:],self.target_fields,self.completed_fields)#,options_basemap=dict(date='2017/02/21 05:00:00'))
 
-                if (raw_input(' ...continue ([y]/n)').lower()=='n'):
+                if (input(' ...continue ([y]/n)').lower()=='n'):
                     break
 
-        if plot: raw_input(' ...finish... ')
+        if plot: input(' ...finish... ')
         return self.scheduled_nites
 
     def write(self,filename):
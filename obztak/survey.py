@@ -20,6 +20,9 @@ from obztak.utils.projector import cel2gal
 from obztak.utils.date import datestring
 from obztak.utils.constants import BANDS,SMASH_POLE,CCD_X,CCD_Y,STANDARDS
 
+# Cache of parsed tile files keyed by (path, mtime)
+TILES = dict()
+
 class Survey(object):
     """Base class for preparing a survey. Creates a list of observation
     windows (observing dates and times) and target fields. The
@@ -143,7 +146,7 @@ class Survey(object):
 
         if infile is None:
             infile = os.path.join(fileio.get_datadir(),'smash_fields_alltiles.txt')
-        data = np.recfromtxt(infile, names=True)
+        data = self.read_tiles(infile)
 
         # Apply footprint selection after tiling/dither
         #sel = obztak.utils.projector.footprint(data['RA'],data['DEC'])
@@ -163,22 +166,27 @@ class Survey(object):
         logging.info("Number of tilings: %d"%ntilings)
         logging.info("Number of filters: %d"%nbands)
 
+        # Fields are ordered by (tiling, hex, band); fill each column
+        # through a broadcast view with that shape
+        shape = (ntilings,nhexes,nbands)
         fields = FieldArray(nfields)
-        fields['HEX'] = np.tile(np.repeat(smash_id,nbands),ntilings)
+        fields['HEX'].reshape(shape)[:] = smash_id[np.newaxis,:,np.newaxis]
         fields['PRIORITY'].fill(1)
-        fields['TILING'] = np.repeat(np.arange(1,ntilings+1),nhexes*nbands)
-        fields['FILTER'] = np.tile(BANDS,nhexes*ntilings)
+        fields['TILING'].reshape(shape)[:] = np.arange(1,ntilings+1)[:,np.newaxis,np.newaxis]
+        fields['FILTER'].reshape(shape)[:] = np.asarray(BANDS)[np.newaxis,np.newaxis,:]
 
+        ra_view = fields['RA'].reshape(shape)
+        dec_view = fields['DEC'].reshape(shape)
         #for i in range(ntilings):
         for i,tiling in enumerate(TILINGS):
-            idx0 = i*nhexes*nbands
-            idx1 = idx0+nhexes*nbands
             ra_dither,dec_dither = dither(ra,dec,tiling[0],tiling[1])
-            fields['RA'][idx0:idx1] = np.repeat(ra_dither,nbands)
-            fields['DEC'][idx0:idx1] = np.repeat(dec_dither,nbands)
+            ra_view[i] = ra_dither[:,np.newaxis]
+            dec_view[i] = dec_dither[:,np.newaxis]
 
-        # Apply footprint selection after tiling/dither
-        sel = self.footprint(fields['RA'],fields['DEC']) # NORMAL OPERATION
+        # Apply footprint selection after tiling/dither (once per
+        # pointing, since the bands share the same position)
+        sel = self.footprint(ra_view[:,:,0].ravel(),dec_view[:,:,0].ravel()) # NORMAL OPERATION
+        sel = np.repeat(sel,nbands)
         if smcnod:
             # Include SMC northern overdensity fields
             sel_smcnod = self.footprintSMCNOD(fields) # SMCNOD OPERATION
@@ -240,6 +248,26 @@ class Survey(object):
         sel = np.ones(len(ra),dtype=bool)
         return sel
 
+    @staticmethod
+    def read_tiles(infile):
+        """ Read (and cache) the file of possible field locations.
+
+        Parameters:
+        -----------
+        infile : File containing all possible field locations
+
+        Returns:
+        --------
+        data   : Read-only record array of the field locations
+        """
+        path = os.path.abspath(infile)
+        key = (path, os.path.getmtime(path))
+        if key not in TILES:
+            data = fileio.txt2rec(path)
+            data.flags.writeable = False
+            TILES[key] = data
+        return TILES[key]
+
     @staticmethod
     def smash_dither(ra,dec,dx,dy):
         """Convert to SMASH coordinates, then dither, and convert back.
@@ -282,10 +310,20 @@ class Survey(object):
         --------
         ra, dec : Dithered ra,dec tuple
         """
-        out = []
-        for _ra,_dec in zip(ra,dec):
-            out.append(obztak.utils.projector.SphericalRotator(_ra,_dec).rotate(dx,dy,invert=True))
-        return np.array(out).T
+        # Same as SphericalRotator(ra,dec).rotate(dx,dy,invert=True)
+        # for each field, with the rotation matrices stacked
+        matrices = obztak.utils.projector.rotation_matrices(ra,dec)
+        inverted = np.linalg.inv(matrices)
+
+        lon,lat = np.radians(dx),np.radians(dy)
+        vec = np.array([np.cos(lat) * np.cos(lon),
+                        np.cos(lat) * np.sin(lon),
+                        np.sin(lat)])
+        vec_prime = np.dot(inverted, vec)
+
+        ra_prime = np.degrees(np.arctan2(vec_prime[:,1], vec_prime[:,0])) % 360.
+        dec_prime = np.degrees(np.arcsin(vec_prime[:,2]))
+        return ra_prime, dec_prime
 
     @staticmethod
     def smash_rotate(ra,dec,dx,dy):
@@ -12,6 +12,7 @@ from collections import OrderedDict as odict
 from obztak.utils.projector import angsep
 
 from obztak.utils import projector as proj
+from obztak.utils.kernels import field_geometry
 from obztak.ctio import CTIO
 from obztak.utils import constants
 from obztak.utils.date import datestring
@@ -28,6 +29,9 @@ CONDITIONS = odict([
 
 class Tactician(object):
     name = 'tactician'
+    # Compute the moon angle of every field (i.e., it enters the weight);
+    # otherwise it is only computed for the selected fields
+    moon_weight = False
 
     def __init__(self, fields=None, observatory=None, **kwargs):
         """ Initialize the survey scheduling tactician.
@@ -51,22 +55,66 @@ class Tactician(object):
         self.set_date(None)
 
     def set_date(self,date):
+        # Ephemeris quantities are computed once per date
+        self._zenith_angle = None
+        self._geometry = None
+        self._moon_angle = None
         if date is not None:
             self.observatory.date = ephem.Date(date)
             self.moon.compute(self.observatory)
             self.sun.compute(self.observatory)
 
     def set_target_fields(self,fields):
+        """
+        Set the target fields. A reference to the array is kept (not a
+        copy); call again if the fields are modified.
+        """
+        self._geometry = None
+        self._moon_angle = None
+        self._available = None
         if fields is not None:
-            self.fields = fields.copy()
+            self.fields = fields
+            # Contiguous copies of the columns used in the weights
+            self._ra = np.ascontiguousarray(self.fields['RA'],dtype=float)
+            self._dec = np.ascontiguousarray(self.fields['DEC'],dtype=float)
+            self._hex = np.ascontiguousarray(self.fields['HEX'])
+            self._tiling = np.ascontiguousarray(self.fields['TILING'])
+            # Sines and cosines of the field coordinates
+            self._trig = proj.sincos(self._ra, self._dec)
+
+            # Constraints that depend only on the (static) declination
+            dec = self._dec
+            self._hour_angle_limit = self.observatory.hour_angle_limit(dec)
+            self._airmass_limit = self.observatory.airmass_limit(dec)
+            self._sel_declination = (dec > constants.SOUTHERN_REACH)
         else:
             self.fields = None
 
-    def set_completed_fields(self,fields):
-        if fields is not None:
-            self.completed_fields = fields.copy()
-        else:
-            self.completed_fields = None
+    def set_available_fields(self,sel):
+        """
+        Restrict the selection to a subset of the target fields without
+        re-deriving the static per-field quantities.
+
+        Parameters:
+        -----------
+        sel : Boolean mask of the available target fields (None for all)
+        """
+        self._available = sel
+
+    def set_completed_fields(self,fields,date=None):
+        """
+        Set the completed fields.
+
+        Parameters:
+        -----------
+        fields : The completed fields (or None); kept by reference
+        date   : Date of the last completed field (parsed if None)
+        """
+        self._geometry = None
+        self.completed_fields = fields
+        if date is None and fields is not None and len(fields):
+            date = ephem.Date(fields[-1]['DATE'])
+        self._previous_date = date
 
     def set_previous_field(self,field):
         #if field is not None:
@@ -81,58 +129,80 @@ class Tactician(object):
 
     @property
     def hour_angle_limit(self):
-        return self.observatory.hour_angle_limit(self.fields['DEC']) 
+        return self._hour_angle_limit
 
     @property
     def airmass_limit(self):
-        return self.observatory.airmass_limit(self.fields['DEC'])
+        return self._airmass_limit
 
     @property
     def zenith_angle(self):
-        # RA and Dec of zenith
-        return np.degrees(self.observatory.radec_of(0,'90'))
+        # RA and Dec of zenith (cached for the current date)
+        if self._zenith_angle is None:
+            self._zenith_angle = np.degrees(self.observatory.radec_of(0,'90'))
+        return self._zenith_angle
+
+    @property
+    def geometry(self):
+        """ The airmass, hour angle, moon angle, and slew of each field.
+
+        These are computed together in a single pass (see
+        `obztak.utils.kernels`) and cached until the date, target
+        fields, or completed fields change. The cached arrays are
+        read-only; copy them before modifying. The moon angle is None
+        unless `moon_weight` is set.
+        """
+        if self._geometry is None:
+            # See here for ra,dec details: http://rhodesmill.org/pyephem/radec
+            moon = np.degrees([self.moon.ra,self.moon.dec]) if self.moon_weight else None
+
+            # Set previous field as last completed field
+            previous = None
+            if (self.completed_fields is not None) and len(self.completed_fields):
+                previous_field = self.completed_fields[-1]
+
+                # Ignore if more than 30 minutes has elapsed
+                if (self.date-self._previous_date) <= 30*ephem.minute:
+                    previous = (previous_field['RA'],previous_field['DEC'])
+
+            geometry = field_geometry(self._ra, self._trig, self.zenith_angle,
+                                      moon, previous)
+            for arr in geometry:
+                if arr is not None: arr.flags.writeable = False
+            self._geometry = geometry
+        return self._geometry
 
     @property
     def airmass(self):
         """ Calculate the airmass of each field. """
-        ra_zenith,dec_zenith = self.zenith_angle
-        return proj.airmass(ra_zenith, dec_zenith, 
-                            self.fields['RA'], self.fields['DEC'])
+        return self.geometry[0]
+
+    @property
+    def hour_angle(self):
+        return self.geometry[1]
+
     @property
     def moon_angle(self):
-        # Include moon angle
-        # See here for ra,dec details: http://rhodesmill.org/pyephem/radec
-        ra_moon,dec_moon = np.degrees([self.moon.ra,self.moon.dec])
-        return proj.angsep(ra_moon, dec_moon, 
-                           self.fields['RA'], self.fields['DEC'])
+        moon_angle = self.geometry[2]
+        if moon_angle is None:
+            if self._moon_angle is None:
+                self._moon_angle = self._calc_moon_angle()
+                self._moon_angle.flags.writeable = False
+            moon_angle = self._moon_angle
+        return moon_angle
+
+    def _calc_moon_angle(self, index=slice(None)):
+        """ Angular separation (deg) between the moon and the fields at `index`. """
+        moon = np.degrees([self.moon.ra,self.moon.dec])
+        return proj.angsep_cached(moon[0], moon[1], *[t[index] for t in self._trig])
+
     @property
     def moon_phase(self):
         return self.moon.phase
 
     @property
     def slew(self):
-        # Set previous field as last completed field
-        previous_field = None
-        if (self.completed_fields is not None) and len(self.completed_fields):
-            previous_field = self.completed_fields[-1]
-
-            # Ignore if more than 30 minutes has elapsed
-            if (self.date-ephem.Date(previous_field['DATE'])) > 30*ephem.minute:
-                previous_field = None
-
-        if previous_field:
-            return angsep(previous_field['RA'],previous_field['DEC'],
-                          self.fields['RA'], self.fields['DEC'])
-        else:
-            return np.zeros(len(self.fields))
-
-    @property
-    def hour_angle(self):
-        ra_zenith,dec_zenith = self.zenith_angle
-        hour_angle = np.copy(self.fields['RA']) - ra_zenith
-        hour_angle[hour_angle < -180.] += 360.
-        hour_angle[hour_angle > 180.] -= 360.
-        return hour_angle
+        return self.geometry[3]
 
     @property
     def viable_fields(self):
@@ -143,33 +213,81 @@ class Tactician(object):
         sel_airmass = self.airmass < self.airmass_limit
 
         # Declination restrictions
-        sel_declination = self.fields['DEC'] > constants.SOUTHERN_REACH
+        sel_declination = self._sel_declination
 
         # Exclude special fields (unless using special tacticians)
         sel_special = self.fields['PRIORITY'] < 90
 
-        viable = sel_hour_angle & sel_airmass & sel_declination & sel_special
+        # Combine the selections in place to avoid temporary arrays
+        viable = sel_hour_angle
+        viable &= sel_airmass
+        viable &= sel_declination
+        viable &= sel_special
+
+        # Fields that have not been masked out (e.g., completed)
+        if self._available is not None:
+            viable &= self._available
         return viable
 
     @property
     def weight(self):
-        weight = self.hour_angle
+        """ Weight of each field (lower is better; inf if not viable). """
         sel = self.viable_fields
-        weight[~sel] = np.inf
-        weight += 6. * 360. * self.fields['TILING'] # Was 6, 60
-        weight += self.slew**3 # slew**2
-        weight += 100. * (self.airmass - 1.)**3
+        weight = np.empty(len(sel))
+        weight.fill(np.inf)
+        index = np.flatnonzero(sel)
+        weight[index] = self.candidate_weight(index)
+        return weight
+
+    def candidate_weight(self, index):
+        """ Weight of the (viable) fields at `index`. """
+        weight = self.hour_angle[index]
+        self._add_weight(weight, index, 6. * 360.) # Was 6, 60
+        return weight
+
+    def _add_weight(self, weight, index, tiling_scale):
+        """ Accumulate the tiling, slew, and airmass penalties into
+        `weight` in place using a single scratch buffer.
+
+        Parameters:
+        -----------
+        weight       : The weight array to increment (modified in place)
+        index        : Index of the fields in `weight`
+        tiling_scale : The weight per tiling
+
+        Returns:
+        --------
+        weight       : The input weight array
+        """
+        tmp = np.multiply(self._tiling[index], tiling_scale)
+        weight += tmp
+        weight += np.power(self.slew[index], 3, out=tmp)
+        np.subtract(self.airmass[index], 1., out=tmp)
+        tmp **= 3
+        tmp *= 100.
+        weight += tmp
         return weight
 
     def select_index(self):
-        index_select = np.argmin(self.weight)
+        # Only evaluate the weight of the viable candidates
+        candidates = np.flatnonzero(self.viable_fields)
+        if len(candidates):
+            weight = self.candidate_weight(candidates)
+            index_select = candidates[np.argmin(weight)]
+        elif self._available is not None:
+            # No viable fields; fall back to the first available field
+            index_select = np.argmax(self._available)
+        else:
+            # No viable fields; fall back to the first field
+            index_select = np.argmin(self.weight)
 
         # Search for other exposures in the same field
-        field_id = self.fields['HEX'][index_select]
-        tiling   = self.fields['TILING'][index_select]
+        field_id = self._hex[index_select]
+        tiling   = self._tiling[index_select]
 
-        index = np.nonzero( (self.fields['HEX'] == field_id) & 
-                            (self.fields['TILING'] == tiling))[0]
+        sel = (self._hex == field_id) & (self._tiling == tiling)
+        if self._available is not None: sel &= self._available
+        index = np.nonzero(sel)[0]
         return index
 
     def select_fields(self):
@@ -184,25 +302,15 @@ class Tactician(object):
 
         fields              = self.fields[index]
         fields['AIRMASS']   = self.airmass[index]
-        fields['DATE']      = map(datestring,self.date+timedelta)
+        fields['DATE']      = [datestring(d) for d in self.date+timedelta]
         fields['SLEW']      = self.slew[index]
-        fields['MOONANGLE'] = self.moon_angle[index]
+        fields['MOONANGLE'] = self._calc_moon_angle(index)
         fields['HOURANGLE'] = self.hour_angle[index]
         return fields
 
 class CoverageTactician(Tactician):
     name = 'coverage'
 
-    @property
-    def weight(self):
-        sel = self.viable_fields
-        weight = self.hour_angle
-        weight[~sel] = np.inf
-        weight += 6. * 360. * self.fields['TILING'] # Was 6, 60
-        weight += self.slew**3 # slew**2
-        weight += 100. * (self.airmass - 1.)**3
-        return weight
-
 class ConditionTactician(Tactician):
     name = 'condition'
 
@@ -210,39 +318,33 @@ class ConditionTactician(Tactician):
         super(ConditionTactician,self).__init__(*args,**kwargs)
         self.mode = kwargs.get('mode',None)
 
-    @property
-    def weight(self):
-        airmass = self.airmass
-        sel = self.viable_fields
-        weight = 2.0 * self.hour_angle
-        weight[~sel] = np.inf
-        weight += 3. * 360. * self.fields['TILING']
-        weight += self.slew**3
+    def candidate_weight(self, index):
+        airmass = self.airmass[index]
+        weight = 2.0 * self.hour_angle[index]
+        # ADW: The airmass term should probably also be in there
+        self._add_weight(weight, index, 3. * 360.)
+
         airmass_min, airmass_max = CONDITIONS[self.mode]
         airmass_cut = ((airmass < airmass_min) | (airmass > airmass_max))
-
-        # ADW: This should probably also be in there
-        weight += 100. * (airmass - 1.)**3
         weight += 5000. * airmass_cut
 
         if self.mode == 'great':
-            weight += 5000. * (self.fields['DEC'] > -80)
+            weight += 5000. * (self._dec[index] > -80)
 
         return weight
 
 class SMCNODTactician(Tactician):
 
-    @property
-    def weight(self):
-        sel = self.viable_fields
-        weight = 10000. * np.logical_not(np.in1d(self.fields['HEX'], obztak.utils.constants.HEX_SMCNOD)).astype(float)
-        weight[~sel] = np.inf
-        weight += 360. * self.fields['TILING']
-        weight += slew
+    def candidate_weight(self, index):
+        weight = 10000. * np.logical_not(np.in1d(self._hex[index], constants.HEX_SMCNOD)).astype(float)
+        weight += 360. * self._tiling[index]
+        weight += self.slew[index]
         return weight
 
 
 class BlissTactician(Tactician):
+    moon_weight = True
+
     CONDITIONS = odict([
         (None,    [0.0, 1.4]),
         ('bliss', [0.0, 1.4]),
@@ -288,7 +390,7 @@ class BlissTactician(Tactician):
         # Don't allow the same field to be scheduled in different bands
         # less than 8 hours apart
         if len(self.completed_fields):
-            dates = np.array(map(ephem.Date,self.completed_fields['DATE']))
+            dates = np.array([ephem.Date(d) for d in self.completed_fields['DATE']])
             recent = self.completed_fields[(self.date - dates) < 10*ephem.hour]
             sel &= ~np.in1d(self.fields.field_id,recent.field_id)
             #cut = np.in1d(self.fields.field_id,recent.field_id)
@@ -314,11 +416,11 @@ class BlissTactician(Tactician):
         weight += 100 * (35./moon_angle)**3
 
         # Try hard to do the first tiling
-        weight += 1e6 * (self.fields['TILING'] - 1)
+        weight += 1e6 * (self._tiling - 1)
 
         # Prioritize Planet 9 Region late in the survey/night
         # Allow i,z exposures at high penalty
-        ra_zenith, dec_zenith = np.degrees(self.observatory.radec_of(0,'90'))
+        ra_zenith, dec_zenith = self.zenith_angle
         if ra_zenith > 270:
             weight += 1e6 * (self.fields['PRIORITY'] - 1)
             #sel &= (np.char.count('iz',self.fields['FILTER']) > 0)
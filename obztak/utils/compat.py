@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+"""
+Python 2/3 compatibility.
+"""
+
+try:
+    basestring = basestring
+except NameError: # Python 3
+    basestring = str
+
+try:
+    input = raw_input
+except NameError: # Python 3
+    input = input
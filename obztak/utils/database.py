@@ -74,7 +74,7 @@ class Database(object):
         self.cursor.execute(query)      
         try: 
             return self.cursor.fetchall()
-        except Exception, e:
+        except Exception as e:
             self.reset()
             raise(e)
         
@@ -102,4 +102,4 @@ if __name__ == "__main__":
 
     db = Database()
     db.connect()
-    print db
+    print(db)
@@ -11,6 +11,8 @@ import logging
 import obztak.utils.constants as constants
 from obztak.ctio import CTIO
 
+from obztak.utils.compat import basestring
+
 def setdefaults(kwargs,defaults):
     for k,v in defaults.items():
         kwargs.setdefault(k,v)
@@ -5,7 +5,6 @@ Deal with file input/output
 import os,pwd
 from os.path import splitext, exists, join
 from collections import OrderedDict as odict
-from matplotlib import mlab
 import numpy as np
 import json
 import logging
@@ -35,17 +34,6 @@ def get_datafile(filename):
     else:
         return filepath
 
-class FormatFloatForce(mlab.FormatFormatStr): 
-    """
-    mlab not doing well...
-    """
-    def __init__(self,fmt=FLOAT_FMT): 
-        mlab.FormatFormatStr.__init__(self,fmt) 
-    def toval(self, x): 
-        return x 
-    def fromstr(self, s): 
-        return float(s) 
-
 def csv2rec(filename, **kwargs):
     #mlab.csv2rec(infile)
     #data = np.recfromcsv(filename,**kwargs)
@@ -69,6 +57,34 @@ def csv2rec(filename, **kwargs):
         data = pd.read_csv(filename,**kwargs).to_records(index=False)
         return data
         
+def txt2rec(filename, **kwargs):
+    """
+    Read a whitespace delimited text file into a record array.
+
+    Faster replacement for `np.recfromtxt(filename, names=True)`; the
+    column names are taken from the first line (which may be commented).
+
+    Parameters:
+    -----------
+    filename : The input text file
+    kwargs   : Keyword arguments passed to `pandas.read_csv`
+
+    Returns:
+    --------
+    data     : Record array of the file contents
+    """
+    import pandas as pd
+    kwargs.setdefault('sep',r'\s+')
+    kwargs.setdefault('comment','#')
+    kwargs.setdefault('float_precision','round_trip')
+
+    with open(filename,'r') as f:
+        line = f.readline()
+    if line.startswith('#'):
+        kwargs.setdefault('names',line.lstrip('#').split())
+
+    return pd.read_csv(filename,**kwargs).to_records(index=False)
+
 def rec2csv(filename,data,**kwargs):
     """
     Wrapper around numpy.savetxt
@@ -77,7 +93,7 @@ def rec2csv(filename,data,**kwargs):
     """
     #formatd = dict()
     #for name,(dtype,size) in data.dtype.fields.items():
-    #    if dtype.kind == 'f': formatd[name] = FormatFloatForce()
+    #    if dtype.kind == 'f': formatd[name] = mlab.FormatFormatStr(FLOAT_FMT)
     #formatd.update(kwargs.pop('formatd',dict()))
     #
     #mlab.rec2csv(data,out,formatd=formatd,**kwargs)        
@@ -90,7 +106,7 @@ def rec2csv(filename,data,**kwargs):
     kwargs.setdefault('mode','w')
     kwargs.setdefault('na_rep','nan')
     
-    with open(filename,'wb') as out:
+    with open(filename,'w') as out:
         out.write(header())
         df.to_csv(out,**kwargs)
 
@@ -101,7 +117,7 @@ def write_json(outfile,data,**kwargs):
     kwargs.setdefault('indent',4)
     json.encoder.FLOAT_REPR = lambda o: format(o, '.4f')
 
-    with open(outfile,'wb') as out:
+    with open(outfile,'w') as out:
         # It'd be nice to have a header
         #out.write(header())
         out.write(json.dumps(data,**kwargs))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Fused kernels for the field selection hot loop.
+
+The per-field geometry is computed with vectorized numpy. Numba is an
+optional dependency providing the same quantities in a single compiled
+loop; it is not used by default since it is no faster than numpy for
+the size of the target field lists.
+"""
+import logging
+
+import numpy as np
+
+from obztak.utils import projector as proj
+
+try:
+    import numba
+except ImportError as e:
+    logging.debug(e)
+    numba = None
+
+############################################################
+
+def _vincenty(slon1, clon1, slat1, clat1, slon2, clon2, slat2, clat2):
+    """ Scalar version of `projector.angsep_cached` (radians out). """
+    sdlon = slon2 * clon1 - clon2 * slon1
+    cdlon = clon2 * clon1 + slon2 * slon1
+
+    num1 = clat2 * sdlon
+    num2 = clat1 * slat2 - slat1 * clat2 * cdlon
+    denominator = slat1 * slat2 + clat1 * clat2 * cdlon
+
+    return np.arctan2(np.hypot(num1,num2), denominator)
+
+def _geometry_kernel(ra, sin_ra, cos_ra, sin_dec, cos_dec, ra_zenith,
+                     zenith, moon, prev, airmass, hour_angle, moon_angle, slew):
+    """ Loop over fields filling the output arrays (compiled by numba).
+
+    The `zenith`, `moon`, and `prev` arguments are arrays of the
+    (sin_lon, cos_lon, sin_lat, cos_lat) of each position; `moon` and
+    `prev` are empty to skip the moon angle and slew.
+    """
+    r2d = 180./np.pi
+    for i in range(len(ra)):
+        # Airmass (infinite below the horizon)
+        sep = _vincenty(zenith[0], zenith[1], zenith[2], zenith[3],
+                        sin_ra[i], cos_ra[i], sin_dec[i], cos_dec[i])
+        secz = 1. / np.cos(sep)
+        airmass[i] = secz if secz >= 1. else np.inf
+
+        # Hour angle wrapped to [-180, 180)
+        hour_angle[i] = (ra[i] - ra_zenith + 180.) % 360. - 180.
+
+        # Angular separation from the moon and previous field
+        if len(moon):
+            moon_angle[i] = _vincenty(moon[0], moon[1], moon[2], moon[3],
+                                      sin_ra[i], cos_ra[i], sin_dec[i], cos_dec[i]) * r2d
+        if len(prev):
+            slew[i] = _vincenty(prev[0], prev[1], prev[2], prev[3],
+                                sin_ra[i], cos_ra[i], sin_dec[i], cos_dec[i]) * r2d
+        else:
+            slew[i] = 0.
+
+if numba is not None:
+    _vincenty = numba.njit(cache=True)(_vincenty)
+    _geometry_kernel = numba.njit(cache=True)(_geometry_kernel)
+
+############################################################
+
+def field_geometry(ra, trig, zenith, moon, previous=None, use_numba=False):
+    """
+    Calculate the airmass, hour angle, moon angle and slew of each field.
+
+    Parameters:
+    -----------
+    ra       : Right ascension of the fields (deg)
+    trig     : `projector.sincos(ra, dec)` of the fields
+    zenith   : (ra, dec) of the zenith (deg)
+    moon     : (ra, dec) of the moon (deg) or None to skip the moon angle
+    previous : (ra, dec) of the previous field (deg) or None
+    use_numba : Use the compiled kernel (requires numba)
+
+    Returns:
+    --------
+    airmass, hour_angle, moon_angle, slew : Arrays for each field
+                                            (moon_angle is None if moon is None)
+    """
+    ra = np.ascontiguousarray(ra, dtype=float)
+    trig = [np.ascontiguousarray(t, dtype=float) for t in trig]
+    ra_zenith = float(zenith[0])
+
+    if use_numba:
+        airmass = np.empty_like(ra)
+        hour_angle = np.empty_like(ra)
+        moon_angle = np.empty_like(ra) if moon is not None else np.empty(0)
+        slew = np.empty_like(ra)
+        moon_trig = np.empty(0) if moon is None else \
+                    np.array(proj.sincos(*map(float,moon)))
+        prev = np.empty(0) if previous is None else \
+               np.array(proj.sincos(*map(float,previous)))
+        _geometry_kernel(ra, trig[0], trig[1], trig[2], trig[3], ra_zenith,
+                         np.array(proj.sincos(*map(float,zenith))),
+                         moon_trig, prev,
+                         airmass, hour_angle, moon_angle, slew)
+        if moon is None: moon_angle = None
+        return airmass, hour_angle, moon_angle, slew
+
+    airmass = 1. / np.cos(np.radians(proj.angsep_cached(zenith[0], zenith[1], *trig)))
+    airmass[airmass < 1.] = np.inf
+
+    # Hour angle wrapped to [-180, 180)
+    hour_angle = ra - ra_zenith
+    hour_angle += 180.
+    np.mod(hour_angle, 360., out=hour_angle)
+    hour_angle -= 180.
+
+    if moon is None:
+        moon_angle = None
+    else:
+        moon_angle = proj.angsep_cached(moon[0], moon[1], *trig)
+
+    if previous is None:
+        slew = np.zeros_like(ra)
+    else:
+        slew = proj.angsep_cached(previous[0], previous[1], *trig)
+
+    return airmass, hour_angle, moon_angle, slew
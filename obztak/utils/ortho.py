@@ -6,6 +6,7 @@ import logging
 import tempfile
 import subprocess
 import warnings
+import functools
 from collections import OrderedDict as odict
 
 from mpl_toolkits.basemap import Basemap
@@ -53,12 +54,15 @@ matplotlib.rcParams.update(params)
 
 DPI = 80
 
+# Cache of polygon files (see `load_polygon`)
+POLYGONS = dict()
+
 ############################################################
 
 class DECamBasemap(Basemap):
 
     def __init__(self, *args, **kwargs):
-        super(DECamBasemap,self).__init__(self,*args,**kwargs)
+        super(DECamBasemap,self).__init__(*args,**kwargs)
         self.draw_parallels()
         self.draw_meridians()
 
@@ -79,8 +83,9 @@ class DECamBasemap(Basemap):
     def proj(self,lon,lat):
         """ Remove points outside of projection """
         x, y = self(np.atleast_1d(lon),np.atleast_1d(lat))
-        x[x > 1e29] = None
-        y[y > 1e29] = None
+        bad = (x > 1e29) | (y > 1e29)
+        x[bad] = np.nan
+        y[bad] = np.nan
         #return np.ma.array(x,mask=x>1e2),np.ma.array(y,mask=y>1e2)
         return x, y
 
@@ -101,7 +106,7 @@ class DECamBasemap(Basemap):
         defaults=dict(color='k', lw=2)
         setdefaults(kwargs,defaults)
 
-        perim = np.loadtxt(filename,dtype=[('ra',float),('dec',float)])
+        perim = load_polygon(filename)
         self.draw_polygon_radec(perim['ra'],perim['dec'],**kwargs)
 
     def draw_polygon_radec(self,ra,dec,**kwargs):
@@ -199,13 +204,12 @@ class DECamBasemap(Basemap):
         defaults = dict(color='green', lw=2)
         setdefaults(kwargs,defaults)
 
-        altitude_radians = (0.5 * np.pi) - np.arccos(1. / airmass)
-        ra_contour = np.zeros(npts)
-        dec_contour = np.zeros(npts)
-        for ii, azimuth in enumerate(np.linspace(0., 2. * np.pi, npts)):
-            ra_radians, dec_radians = observatory.radec_of(azimuth, '%.2f'%(np.degrees(altitude_radians)))
-            ra_contour[ii] = np.degrees(ra_radians)
-            dec_contour[ii] = np.degrees(dec_radians)
+        # Circle of constant zenith angle around the zenith (the same
+        # definition of airmass used by the tactician)
+        ra_zenith, dec_zenith = np.degrees(observatory.radec_of(0, '90'))
+        zenith_angle = np.degrees(np.arccos(1. / airmass))
+        ra_contour, dec_contour = obztak.utils.projector.small_circle(
+            ra_zenith, dec_zenith, zenith_angle, npts)
         xy = self.proj(ra_contour, dec_contour)
         self.plot(*xy, **kwargs)
 
@@ -469,9 +473,56 @@ class DECamFocalPlane(object):
         corners[:,:,1] = y
         return corners
 
+############################################################
+
+def draw_once(func):
+    """ Decorator that suspends interactive redraws while `func` adds
+    artists and draws the figure once when it returns.
+
+    In interactive mode every Basemap plotting call triggers a full
+    redraw of the figure, which dominates the time to build a map.
+    Figures created while redraws are suspended are not shown by the
+    GUI backends, so they are shown explicitly afterwards.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        interactive = matplotlib.is_interactive()
+        if not interactive:
+            return func(*args, **kwargs)
+        matplotlib.interactive(False)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            matplotlib.interactive(interactive)
+            plt.show(block=False)
+            plt.draw()
+    return wrapper
+
+def load_polygon(filename):
+    """ Read (and cache) the ra,dec vertices of a polygon file.
+
+    Parameters:
+    -----------
+    filename : The polygon file
+
+    Returns:
+    --------
+    perim    : Read-only record array of the polygon vertices
+    """
+    if filename not in POLYGONS:
+        perim = np.loadtxt(filename,dtype=[('ra',float),('dec',float)])
+        perim.flags.writeable = False
+        POLYGONS[filename] = perim
+    return POLYGONS[filename]
+
 ############################################################
 # Depricated module functions
 
+def safeProj(basemap, lon, lat):
+    msg = "safeProj is depricated; use DECamBasemap.proj instead."
+    warnings.warn(msg)
+    return basemap.proj(lon, lat)
+
 def drawDES(basemap, color='red'):
     msg = "drawDES is depricated; use DECamBasemap.draw_des instead."
     warnings.warn(msg)
@@ -490,7 +541,7 @@ def drawMAGLITES(basemap, color='blue'):
 def drawAirmassContour(basemap, observatory, airmass, n=360, s=50):
     msg = "drawAirmassContour is depricated; use DECamBasemap.draw_airmass instead."
     warnings.warn(msg)
-    basemap.draw_airmass(observatory=observatory, airmass=airmass, n=n, s=s)
+    basemap.draw_airmass(observatory=observatory, airmass=airmass, npts=n)
 
 def drawZenith(basemap, observatory):
     """
@@ -507,6 +558,7 @@ def drawMoon(basemap, date):
 
 ############################################################
 
+@draw_once
 def makePlot(date=None, name=None, figsize=(10.5,8.5), dpi=80, s=50, center=None, airmass=True, moon=True, des=True, smash=False, maglites=None, bliss=None, galaxy=True):
     """
     Create map in orthographic projection
@@ -547,6 +599,7 @@ def makePlot(date=None, name=None, figsize=(10.5,8.5), dpi=80, s=50, center=None
 
     return fig, basemap
 
+@draw_once
 def plotField(field, target_fields=None, completed_fields=None, options_basemap={}, **kwargs):
     """
     Plot a specific target field.
@@ -633,10 +686,11 @@ def plotFields(fields=None,target_fields=None,completed_fields=None,options_base
         tmp[0] = fields
         fields = tmp
 
+    # Concatenate once and plot each field with the slice completed before it
+    ncompleted = 0 if completed_fields is None else len(completed_fields)
+    completed = fields if completed_fields is None else completed_fields + fields
     for i,f in enumerate(fields):
-        basemap = plotField(fields[i],target_fields,completed_fields,options_basemap,**kwargs)
-        if completed_fields is None: completed_fields = FieldArray()
-        completed_fields = completed_fields + fields[[i]]
+        basemap = plotField(fields[i],target_fields,completed[:ncompleted+i],options_basemap,**kwargs)
         plt.pause(0.001)
 
     return basemap
@@ -646,8 +700,6 @@ def movieFields(outfile,fields=None,target_fields=None,completed_fields=None,**k
         msg = "Only animated gif currently supported."
         raise Exception(msg)
 
-    tmpdir = tempfile.mkdtemp()
-
     if fields is None:
         fields = completed_fields[-1]
 
@@ -656,21 +708,46 @@ def movieFields(outfile,fields=None,target_fields=None,completed_fields=None,**k
         tmp[0] = fields
         fields = tmp
 
+    # Concatenate once and plot each field with the slice completed before it
+    ncompleted = 0 if completed_fields is None else len(completed_fields)
+    completed = fields if completed_fields is None else completed_fields + fields
+
+    # Write the frames in process with imageio when it is available;
+    # otherwise fall back to ImageMagick 'convert'
+    try:
+        import imageio
+    except ImportError as e:
+        logging.debug(e)
+        imageio = None
+
     plt.ioff()
-    for i,f in enumerate(fields):
-        plotField(fields[i],target_fields,completed_fields,**kwargs)
-        png = os.path.join(tmpdir,'field_%08i.png'%i)
-        plt.savefig(png,dpi=DPI)
-        if completed_fields is None: completed_fields = FieldArray()
-        completed_fields = completed_fields + fields[[i]]
-    plt.ion()
-
-    cmd = 'convert -delay 10 -loop 0 %s/*.png %s'%(tmpdir,outfile)
-    logging.info(cmd)
-    subprocess.call(cmd,shell=True)
-    shutil.rmtree(tmpdir)
+    try:
+        if imageio is not None:
+            # 100 ms per frame matches 'convert -delay 10'
+            with imageio.get_writer(outfile, mode='I', duration=100, loop=0) as writer:
+                for i,f in enumerate(fields):
+                    plotField(fields[i],target_fields,completed[:ncompleted+i],**kwargs)
+                    canvas = plt.gcf().canvas
+                    canvas.draw()
+                    writer.append_data(np.asarray(canvas.buffer_rgba())[...,:3])
+        else:
+            tmpdir = tempfile.mkdtemp()
+            try:
+                for i,f in enumerate(fields):
+                    plotField(fields[i],target_fields,completed[:ncompleted+i],**kwargs)
+                    png = os.path.join(tmpdir,'field_%08i.png'%i)
+                    # Frames at the figure dpi (as captured by imageio)
+                    plt.savefig(png,dpi=plt.gcf().dpi)
+                cmd = 'convert -delay 10 -loop 0 %s/*.png %s'%(tmpdir,outfile)
+                logging.info(cmd)
+                subprocess.call(cmd,shell=True)
+            finally:
+                shutil.rmtree(tmpdir)
+    finally:
+        plt.ion()
     return outfile
 
+@draw_once
 def plotWeights(date, target_fields, weights,options_basemap={},**kwargs):
     defaults = dict(c=weights, edgecolor='none', s=50, vmin=np.min(weights), vmax=np.min(weights) + 300., cmap='Spectral')
     setdefaults(kwargs,defaults)
@@ -695,6 +772,7 @@ def plotWeights(date, target_fields, weights,options_basemap={},**kwargs):
         pass
     plt.sca(fig.axes[0])
 
+@draw_once
 def plotWeight(field, target_fields, weight, **kwargs):
     if isinstance(field,FieldArray):
         field = field[-1]
@@ -799,7 +877,7 @@ def plot_maglites_nightsum(fields,nitestr):
     from obztak.utils.database import Database
 
     date = nite2utc(nitestr)
-    new = (np.array(map(utc2nite,fields['DATE'])) == nitestr)
+    new = (np.array([utc2nite(d) for d in fields['DATE']]) == nitestr)
     new_fields = fields[new]
     old_fields = fields[~new]
 
@@ -872,7 +950,7 @@ def plot_bliss_nightsum(fields,nitestr):
     plot_bliss_coverage(fields)
     plt.savefig('nightsum_coverage_%s.png'%nitestr)
 
-    new = (np.array(map(utc2nite,fields['DATE'])) == nitestr)
+    new = (np.array([utc2nite(d) for d in fields['DATE']]) == nitestr)
     new_fields = fields[new]
     old_fields = fields[~new]
 
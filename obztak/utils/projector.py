@@ -3,6 +3,9 @@ import numpy as np
 import healpy as hp
 
 import obztak.utils.constants
+
+from obztak.utils.compat import basestring
+
 ############################################################
 
 def angsep(lon1,lat1,lon2,lat2):
@@ -35,6 +38,65 @@ def angsep(lon1,lat1,lon2,lat2):
 
     return np.degrees(np.arctan2(np.hypot(num1,num2), denominator))
 
+def sincos(lon, lat):
+    """
+    Sines and cosines of sky coordinates (deg) for `angsep_cached`.
+
+    Returns:
+    --------
+    sin_lon, cos_lon, sin_lat, cos_lat
+    """
+    lon,lat = np.radians(lon),np.radians(lat)
+    return np.sin(lon), np.cos(lon), np.sin(lat), np.cos(lat)
+
+def angsep_cached(lon1, lat1, sin_lon2, cos_lon2, sin_lat2, cos_lat2):
+    """
+    Angular separation (deg) between a sky coordinate and a set of
+    coordinates with precomputed sines and cosines (see `sincos`).
+    Uses the same Vincenty formula as `angsep`, but avoids evaluating
+    trigonometric functions over the second set of coordinates.
+    """
+    lon1,lat1 = np.radians([lon1,lat1])
+    slon1 = np.sin(lon1)
+    clon1 = np.cos(lon1)
+    slat1 = np.sin(lat1)
+    clat1 = np.cos(lat1)
+
+    # Angle difference identities for sin/cos(lon2 - lon1)
+    sdlon = sin_lon2 * clon1 - cos_lon2 * slon1
+    cdlon = cos_lon2 * clon1 + sin_lon2 * slon1
+
+    num1 = cos_lat2 * sdlon
+    num2 = clat1 * sin_lat2 - slat1 * cos_lat2 * cdlon
+    denominator = slat1 * sin_lat2 + clat1 * cos_lat2 * cdlon
+
+    return np.degrees(np.arctan2(np.hypot(num1,num2), denominator))
+
+def small_circle(lon, lat, radius, npts=360):
+    """
+    Coordinates (deg) of a circle of constant angular radius (deg)
+    around a sky position (deg).
+
+    Parameters:
+    -----------
+    lon    : Longitude of the center (deg)
+    lat    : Latitude of the center (deg)
+    radius : Angular radius of the circle (deg)
+    npts   : Number of points along the circle
+
+    Returns:
+    --------
+    lon, lat : Coordinates of the circle (deg)
+    """
+    lon0,lat0,radius = np.radians([lon,lat,radius])
+    bearing = np.linspace(0., 2.*np.pi, npts)
+
+    lat1 = np.arcsin(np.sin(lat0) * np.cos(radius) +
+                     np.cos(lat0) * np.sin(radius) * np.cos(bearing))
+    lon1 = lon0 + np.arctan2(np.sin(bearing) * np.sin(radius) * np.cos(lat0),
+                             np.cos(radius) - np.sin(lat0) * np.sin(lat1))
+    return np.degrees(lon1) % 360., np.degrees(lat1)
+
 ############################################################
 
 def airmass(lon_zenith, lat_zenith, lon, lat):
@@ -189,6 +251,40 @@ class SphericalRotator:
 
         return (np.degrees(lon_prime) % 360.), np.degrees(lat_prime)
 
+def rotation_matrices(lon_ref, lat_ref):
+    """
+    Stacked rotation matrices of `SphericalRotator(lon_ref, lat_ref)`
+    for arrays of fiducial points.
+
+    Parameters:
+    -----------
+    lon_ref  : Longitude of the fiducial points (deg)
+    lat_ref  : Latitude of the fiducial points (deg)
+
+    Returns:
+    --------
+    matrices : Array of rotation matrices with shape (N,3,3)
+    """
+    phi = (-np.pi / 2.) + np.radians(np.atleast_1d(lon_ref))
+    theta = np.radians(np.atleast_1d(lat_ref))
+    psi = np.radians(90.)
+
+    cos_psi,sin_psi = np.cos(psi),np.sin(psi)
+    cos_phi,sin_phi = np.cos(phi),np.sin(phi)
+    cos_theta,sin_theta = np.cos(theta),np.sin(theta)
+
+    matrices = np.empty(phi.shape + (3,3))
+    matrices[:,0,0] = cos_psi * cos_phi - cos_theta * sin_phi * sin_psi
+    matrices[:,0,1] = cos_psi * sin_phi + cos_theta * cos_phi * sin_psi
+    matrices[:,0,2] = sin_psi * sin_theta
+    matrices[:,1,0] = -sin_psi * cos_phi - cos_theta * sin_phi * cos_psi
+    matrices[:,1,1] = -sin_psi * sin_phi + cos_theta * cos_phi * cos_psi
+    matrices[:,1,2] = cos_psi * sin_theta
+    matrices[:,2,0] = sin_theta * sin_phi
+    matrices[:,2,1] = -sin_theta * cos_phi
+    matrices[:,2,2] = cos_theta
+    return matrices
+
 ############################################################
 
 class Projector:
@@ -221,7 +317,7 @@ class Projector:
             self.sphere_to_image_func = cartesianSphereToImage
             self.image_to_sphere_func = cartesianImageToSphere
         else:
-            print 'WARNING: %s not recognized'%(proj_type)
+            print('WARNING: %s not recognized'%(proj_type))
 
     def sphereToImage(self, lon, lat):
         lon_rotated, lat_rotated = self.rotator.rotate(lon, lat)
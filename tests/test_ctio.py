@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+"""
+Test the CTIO observatory.
+"""
+import numpy as np
+
+from obztak.ctio import CTIO
+from obztak.utils import projector as proj
+
+def test_hour_angle_limits():
+    ctio = CTIO()
+    hms = ctio.constraints['HA'].astype(str)
+    test_ha_degrees = np.array([proj.hms2dec(ha) for ha in hms]) - 1.25
+    np.testing.assert_almost_equal(ctio.ha_degrees,test_ha_degrees)
+    np.testing.assert_almost_equal(ctio.hour_angle_limit(-89.),
+                                   test_ha_degrees[0])
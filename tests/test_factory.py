@@ -62,3 +62,14 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description=__doc__)
     args = parser.parse_args()
+
+def test_scheduler_defaults():
+    import os
+    TEST = [
+        ('maglites',obztak.maglites.MaglitesScheduler),
+        ('bliss',obztak.bliss.BlissScheduler),
+    ]
+    keys = list(obztak.scheduler.Scheduler._defaults.keys())
+    for survey,cls in TEST:
+        assert list(cls._defaults.keys()) == keys
+        assert os.path.basename(cls._defaults['targets']).startswith(survey)
@@ -57,6 +57,24 @@ def test_empty_fields():
     assert len(fields) == 0
     np.testing.assert_equal(fields.dtype.names,['HEX','RA','DEC','FILTER','EXPTIME','TILING','PRIORITY','DATE','AIRMASS','SLEW','MOONANGLE','HOURANGLE'])
 
+def test_str_fields():
+    import ephem
+    fields = obztak.field.FieldArray(2)
+    fields['HEX'] = [6260,6261]
+    fields['TILING'] = 1
+    fields['FILTER'] = ['g','r']
+    fields['DATE'] = '2017/02/22 06:00:00'
+
+    # Text columns hold native strings
+    assert isinstance(fields['FILTER'][0],str)
+    assert ephem.Date(fields['DATE'][0]) == ephem.Date('2017/02/22 06:00:00')
+    np.testing.assert_equal(fields.unique_id,['6260-01-g','6261-01-r'])
+    np.testing.assert_equal(fields.object,['MAGLITES field: 6260-01-g',
+                                           'MAGLITES field: 6261-01-r'])
+
+    fields = fields + fields
+    assert len(fields) == 4
+
 def test_sispi_fields():
     sispi = json.loads(open(FILENAME).read())
     fields = obztak.field.FieldArray.read(FILENAME)
@@ -89,9 +107,9 @@ def test_database_fields():
         (5345,106.011075,-58.41872, 'r',90.0,1,1,'2016/02/11 05:30:32.472',1.35,0.0015, 98.7751, 46.357625),
         (6062,157.487654,-76.852859,'g',90.0,1,1,'2016/02/13 09:00:12.732',1.62,1.4089, 106.6357,49.368042),
         (2206,345.810525,-70.197803,'g',90.0,2,1,'2016/06/30 08:37:52.759',1.31,1.6166, 91.3154, -8.633625)],
-        dtype=[('HEX','<i8'),('RA','<f8'),('DEC','<f8'),('FILTER','S1'),
+        dtype=[('HEX','<i8'),('RA','<f8'),('DEC','<f8'),('FILTER',(str,1)),
                ('EXPTIME','<f8'),('TILING','<i8'),('PRIORITY','<i8'),
-               ('DATE','S30'), ('AIRMASS','<f8'),('SLEW','<f8'),
+               ('DATE',(str,30)), ('AIRMASS','<f8'),('SLEW','<f8'),
                ('MOONANGLE','<f8'),('HOURANGLE','<f8')])
 
     np.testing.assert_equal(fields[idx],test)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+"""
+Test file input/output.
+"""
+import os
+
+import numpy as np
+
+from obztak.utils import fileio
+
+def test_txt2rec():
+    filename = os.path.join(fileio.get_datadir(),'smash_fields_alltiles.txt')
+    data = fileio.txt2rec(filename)
+    test_data = np.recfromtxt(filename,names=True)
+
+    assert data.dtype.names == test_data.dtype.names
+    for name in test_data.dtype.names:
+        np.testing.assert_equal(data[name],test_data[name],err_msg=name)
@@ -53,6 +53,61 @@ def test_schedule_night():
 
     check_dict(value,out[index])
 
+def test_inside_window():
+    import ephem
+    from obztak.scheduler import Scheduler
+    windows = [['2017/02/21 23:50:00','2017/02/22 09:30:00'],
+               ['2017/02/22 23:50:00','2017/02/23 09:30:00']]
+    scheduler = Scheduler(windows=windows,completed_fields='None')
+
+    assert scheduler._inside_window(ephem.Date('2017/02/21 23:50:00'))
+    assert scheduler._inside_window(ephem.Date('2017/02/23 05:00:00'))
+    assert not scheduler._inside_window(ephem.Date('2017/02/21 23:49:00'))
+    assert not scheduler._inside_window(ephem.Date('2017/02/22 09:30:00'))
+    assert not scheduler._inside_window(ephem.Date('2017/02/22 12:00:00'))
+    assert not scheduler._inside_window(ephem.Date('2017/02/24 00:00:00'))
+
+def test_extend_fields():
+    import numpy as np
+    from obztak.scheduler import Scheduler
+    scheduler = Scheduler(completed_fields='None')
+
+    # Snapshot the fields so the buffer is compared to an independent copy
+    fields = scheduler.target_fields[:300].copy()
+    for i in range(len(fields)):
+        scheduler._extend('completed_fields',fields[[i]])
+    np.testing.assert_equal(scheduler.completed_fields,fields)
+
+    # Replacing the attribute starts a new buffer
+    target = scheduler.target_fields.copy()
+    scheduler.completed_fields = scheduler.target_fields[500:510]
+    scheduler._extend('completed_fields',fields[100:110])
+    np.testing.assert_equal(scheduler.completed_fields,
+                            target[500:510]+fields[100:110])
+    # ...without writing into the array it replaced
+    np.testing.assert_equal(scheduler.target_fields,target)
+
+def test_replace_completed_fields():
+    import numpy as np
+    import ephem
+    from obztak.scheduler import Scheduler
+    scheduler = Scheduler(completed_fields='None')
+    fields = scheduler.target_fields
+
+    # Replacing with an array of the same length rebuilds the mask
+    completed = fields[:20].copy()
+    completed['DATE'] = '2017/02/22 05:00:00'
+    scheduler.completed_fields = completed[:10]
+    scheduler.select_field(ephem.Date('2017/02/22 06:00:00'))
+    scheduler.completed_fields = completed[10:]
+    scheduler.select_field(ephem.Date('2017/02/22 06:00:00'))
+    np.testing.assert_equal(scheduler._incomplete,
+                            ~np.in1d(fields['ID'],fields['ID'][10:20]))
+
+    # The last completed date follows the current array
+    completed['DATE'][-1] = '2017/02/22 05:30:00'
+    assert scheduler._last_completed_date() == ephem.Date('2017/02/22 05:30:00')
+
 def NOTEST_schedule_survey():
     kwargs = dict(outfile='survey_test')
     opts = make_options(kwargs)
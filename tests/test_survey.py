@@ -31,6 +31,22 @@ def test_prepare_windows():
     assert windows['UTC_START'][2] == '2017/02/24 00:27:14'
     assert windows['UTC_END'][2] == '2017/02/24 04:46:37'
 
+def test_decam_dither():
+    from obztak.utils.projector import SphericalRotator
+    ra = np.linspace(0,359,50)
+    dec = np.linspace(-89,89,50)
+    dx,dy = 0.75,0.75
+
+    # Compare to the per-field rotation
+    test = np.array([SphericalRotator(_ra,_dec).rotate(dx,dy,invert=True)
+                     for _ra,_dec in zip(ra,dec)]).T
+    ra_dither,dec_dither = Survey.decam_dither(ra,dec,dx,dy)
+
+    # Wrap the RA difference so that 0 and 360 agree
+    dra = (ra_dither - test[0] + 180.) % 360. - 180.
+    np.testing.assert_allclose(dra,0,rtol=0,atol=1e-10)
+    np.testing.assert_allclose(dec_dither,test[1],rtol=0,atol=1e-10)
+
 def test_survey_prepare():
     kwargs = dict(fields='test_target_fields.csv',windows='test_windows.csv')
     opts = make_options(kwargs)
@@ -117,6 +117,42 @@ def test_calculate_hour_angle():
     np.testing.assert_equal(tac.fields,fields,
                             err_msg ="fields have been altered")
 
+def check_field_geometry(use_numba):
+    from obztak.utils import projector as proj
+    from obztak.utils import kernels
+
+    tac = create_tactician()
+    fields = create_fields()
+    ra,dec = fields['RA'],fields['DEC']
+    zenith = tac.zenith_angle
+    moon = np.degrees([tac.moon.ra,tac.moon.dec])
+    previous = (137.,-43.)
+
+    airmass,hour_angle,moon_angle,slew = kernels.field_geometry(
+        ra,proj.sincos(ra,dec),zenith,moon,previous,use_numba=use_numba)
+
+    test_airmass = proj.airmass(zenith[0],zenith[1],ra,dec)
+    test_hour_angle = (ra - zenith[0] + 180.) % 360. - 180.
+    test_moon_angle = proj.angsep(moon[0],moon[1],ra,dec)
+    test_slew = proj.angsep(previous[0],previous[1],ra,dec)
+
+    np.testing.assert_almost_equal(airmass,test_airmass,err_msg='airmass')
+    np.testing.assert_almost_equal(hour_angle,test_hour_angle,
+                                   err_msg='hour_angle')
+    np.testing.assert_almost_equal(moon_angle,test_moon_angle,
+                                   err_msg='moon_angle')
+    np.testing.assert_almost_equal(slew,test_slew,err_msg='slew')
+
+def test_field_geometry():
+    check_field_geometry(use_numba=False)
+
+def test_field_geometry_numba():
+    from obztak.utils import kernels
+    if kernels.numba is None:
+        from unittest import SkipTest
+        raise SkipTest("numba not installed")
+    check_field_geometry(use_numba=True)
+
 def test_viable_fields():
     tac = create_tactician()
     sel = tac.viable_fields